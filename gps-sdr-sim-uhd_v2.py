@@ -25,7 +25,10 @@ Example:
     --scale 0.0078125
 
 Notes:
-  - scale defaults to 1/128 (≈0.0078125) to map int8 [-128..127] -> ~[-1..1]
+  - TX streams the int8 file as sc8 straight to the device; the DAC maps
+    full-scale int8 to ~[-1..1] itself, so --scale is kept for CLI
+    compatibility but no longer applied on the host.
+  - RX is captured as sc16 (interleaved int16 IQ); convert offline.
   - Adjust gains for your attenuator (you mentioned 30 dB).
 """
 
@@ -34,34 +37,28 @@ import time
 import argparse
 from gnuradio import gr, blocks, uhd
 
+
 class TxRxTop(gr.top_block):
     def __init__(self, dev_addr, samp_rate, freq, tx_file, rx_out,
                  tx_ant, rx_ant, tx_gain, rx_gain, scale):
         gr.top_block.__init__(self, "gps_sdr_sim_txrx")
 
-        # --- TX side: read interleaved int8 IQ -> deinterleave -> char_to_float -> scale -> float_to_complex -> usrp_sink
-        # File source reading bytes (signed char). GNU Radio file_source reads raw bytes as unsigned char by default;
-        # we use gr.sizeof_char (signed/unsigned behavior in char_to_float will handle numeric mapping).
-        self.file_src = blocks.file_source(gr.sizeof_char, tx_file, repeat=True)
-
-        # Deinterleave into two streams: even = I, odd = Q (both bytes)
-        self.deint = blocks.deinterleave(gr.sizeof_char)  # creates two outputs
-
-        # Convert bytes->float for I and Q separately.
-        self.char_to_float_I = blocks.char_to_float(1, 1.0)
-        self.char_to_float_Q = blocks.char_to_float(1, 1.0)
-
-        # Apply scaling to map int8 range to approx [-1, 1]
-        self.scale_I = blocks.multiply_const_ff(scale)
-        self.scale_Q = blocks.multiply_const_ff(scale)
-
-        # Build complex samples from two float streams
-        self.float_to_complex = blocks.float_to_complex(1)
+        # --- TX side: feed the int8 IQ file to the sink as sc8, no host conversion.
+        # gpssim.bin already is interleaved int8 IQ, which is exactly the sc8
+        # wire format — so there is nothing to convert. One file_source item is
+        # one I,Q pair (2 bytes, i.e. gr.sizeof_short); the hardware maps
+        # full-scale int8 to +/-1.0 itself, so `scale` is not applied on the
+        # host anymore. sc8 on the wire also halves host-to-FPGA bandwidth.
+        self.file_src = blocks.file_source(gr.sizeof_short, tx_file, repeat=True)
 
         # USRP sink (TX)
+        # Enlarged transport rings (default X310 frame counts are too small
+        # at modest rates and drop on scheduler jitter).
         self.usrp_sink = uhd.usrp_sink(
             device_addr=dev_addr,
-            stream_args=uhd.stream_args(cpu_format="fc32", channels=[0])
+            stream_args=uhd.stream_args(
+                cpu_format="sc8", otw_format="sc8", channels=[0],
+                args="num_send_frames=1024,send_frame_size=8000")
         )
         self.usrp_sink.set_samp_rate(samp_rate)
         self.usrp_sink.set_center_freq(freq, 0)
@@ -70,34 +67,26 @@ class TxRxTop(gr.top_block):
         # Optional: set bandwidth if needed: self.usrp_sink.set_bandwidth(bw,0)
 
         # --- RX side: usrp_source -> file_sink
+        # Capture as sc16 (one int16 I,Q pair per sample) for half the
+        # file-write bandwidth of fc32; convert to float offline when
+        # analyzing, not in the streaming path.
         self.usrp_src = uhd.usrp_source(
             device_addr=dev_addr,
-            stream_args=uhd.stream_args(cpu_format="fc32", channels=[0])
+            stream_args=uhd.stream_args(
+                cpu_format="sc16", otw_format="sc16", channels=[0],
+                args="num_recv_frames=1024,recv_frame_size=8000")
         )
         self.usrp_src.set_samp_rate(samp_rate)
         self.usrp_src.set_center_freq(freq, 0)
         self.usrp_src.set_gain(rx_gain, 0)
         self.usrp_src.set_antenna(rx_ant, 0)
 
-        self.file_sink = blocks.file_sink(gr.sizeof_gr_complex, rx_out)
+        self.file_sink = blocks.file_sink(gr.sizeof_short * 2, rx_out)
         self.file_sink.set_unbuffered(False)
 
         # --- Connections
-        # file_src -> deint (two outputs)
-        self.connect(self.file_src, self.deint)
-
-        # deint output 0 -> char_to_float_I -> scale_I -> float_to_complex LHS
-        self.connect((self.deint, 0), self.char_to_float_I)
-        self.connect(self.char_to_float_I, self.scale_I)
-        self.connect(self.scale_I, (self.float_to_complex, 0))
-
-        # deint output 1 -> char_to_float_Q -> scale_Q -> float_to_complex RHS
-        self.connect((self.deint, 1), self.char_to_float_Q)
-        self.connect(self.char_to_float_Q, self.scale_Q)
-        self.connect(self.scale_Q, (self.float_to_complex, 1))
-
-        # float_to_complex -> usrp_sink (TX)
-        self.connect(self.float_to_complex, self.usrp_sink)
+        # file_src (sc8 pairs) -> usrp_sink (TX), no format conversion
+        self.connect(self.file_src, self.usrp_sink)
 
         # usrp_src (RX) -> file_sink
         self.connect(self.usrp_src, self.file_sink)
@@ -109,12 +98,12 @@ def parse_args():
     p.add_argument("--samp-rate", type=float, default=2500000.0, help="Sample rate (Hz)")
     p.add_argument("--freq", type=float, default=1575420000.0, help="Center frequency (Hz)")
     p.add_argument("--tx-file", default="gpssim.bin", help="Input GPS-SIM file (interleaved int8 IQ)")
-    p.add_argument("--rx-out", default="gps_rx.dat", help="Output file for received complex samples (fc32 interleaved)")
+    p.add_argument("--rx-out", default="gps_rx.dat", help="Output file for received samples (sc16 interleaved IQ)")
     p.add_argument("--tx-ant", default="TX/RX", help="TX antenna name (exact from uhd_usrp_probe)")
     p.add_argument("--rx-ant", default="RX2", help="RX antenna name (exact from uhd_usrp_probe)")
     p.add_argument("--tx-gain", type=float, default=20.0, help="TX gain")
     p.add_argument("--rx-gain", type=float, default=30.0, help="RX gain")
-    p.add_argument("--scale", type=float, default=(1.0/128.0), help="Scale factor to map int8->float (default 1/128)")
+    p.add_argument("--scale", type=float, default=(1.0/128.0), help="Unused with sc8 streaming (kept for compatibility)")
     return p.parse_args()
 
 if __name__ == "__main__":
@@ -11,13 +11,77 @@ CONFIGURE the USER settings below before running.
 DO NOT radiate GPS signals — use a cable + attenuator (>=30 dB) or shielded box.
 """
 
+import fcntl
+import mmap
+import multiprocessing
 import os
+import queue
 import sys
 import time
 import threading
+from multiprocessing import shared_memory
 import numpy as np
+import scipy.fft
 import uhd
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+try:
+    # cuFFT turns the ~2M-point post-capture correlation into a single GPU
+    # call; cupy can fail at import for reasons beyond a missing package
+    # (no driver, no device), so catch broadly and fall back to the CPU.
+    import cupy
+    HAVE_CUPY = True
+except Exception:
+    HAVE_CUPY = False
+
+try:
+    import pyfftw
+    # Persistent plan cache: repeated analyze_correlation calls at the same
+    # transform length reuse FFTW wisdom instead of re-planning every time.
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(60)
+    HAVE_PYFFTW = True
+except ImportError:
+    HAVE_PYFFTW = False
+
+if HAVE_PYFFTW:
+    _FFT_THREADS = max(1, (os.cpu_count() or 2) // 2)
+
+    def _fft(x, n):
+        return pyfftw.interfaces.numpy_fft.fft(x, n, threads=_FFT_THREADS)
+
+    def _ifft(x):
+        return pyfftw.interfaces.numpy_fft.ifft(x, threads=_FFT_THREADS)
+
+    def _rfft(x, n):
+        return pyfftw.interfaces.numpy_fft.rfft(x, n, threads=_FFT_THREADS)
+else:
+    def _fft(x, n):
+        return scipy.fft.fft(x, n, workers=-1)
+
+    def _ifft(x):
+        return scipy.fft.ifft(x, workers=-1)
+
+    def _rfft(x, n):
+        return scipy.fft.rfft(x, n, workers=-1)
+
+def aligned_c64(n):
+    """Zeroed complex64 buffer, 64-byte aligned when pyfftw is available.
+
+    Keeps UHD's copies into the recv buffer and any SIMD reductions over it
+    on aligned loads; plain np.zeros otherwise (numpy's 16-byte default).
+    """
+    if HAVE_PYFFTW:
+        buf = pyfftw.empty_aligned(n, dtype='complex64', n=64)
+        buf[:] = 0
+        return buf
+    return np.zeros(n, dtype=np.complex64)
+
 # ------------------ USER SETTINGS (edit) ------------------
 USR_ADDR = "addr=192.168.10.2"   # X310 IP
 CHAN = 1                        # channel 0 or 1 (set to 1 for RF1)
@@ -33,23 +97,76 @@ RX_GAIN = 10.0                  # start low
 OUT_RX_FILENAME = "rx_iq.bin"   # captured rx output (complex64)
 CORR_SEARCH_SAMPLES = int(1e6)  # number of RX samples to use for correlation (cap)
 TX_REF_SAMPLES = int(1e5)       # number of TX samples to correlate with (cap)
+REAL_REF = False                # TX reference is a real chip sequence (BPSK code):
+                                # correlate via rfft on tx.real, ~halving the TX FFT cost
+RX_RING_CHUNKS = 64             # shared-memory ring depth (chunks) between RX process and writer
+COARSE_ACQ_BLOCKS = 10          # number of 1 ms RX blocks for coarse acquisition
+DOPPLER_MAX = 5000.0            # coarse acquisition Doppler search range (+/- Hz)
+DOPPLER_STEP = 500.0            # coarse acquisition Doppler bin width (Hz)
 # ---------------------------------------------------------
 
 def load_iq_file(path, fmt):
     if not os.path.exists(path):
         raise FileNotFoundError(f"{path} not found")
     if fmt == "fc32":
-        data = np.fromfile(path, dtype=np.complex64)
+        # memmap instead of fromfile: no multi-GB heap copy at startup, the
+        # OS pages the file in lazily as the TX loop walks it. The send loop
+        # stages each chunk through a preallocated buffer, so handing out a
+        # read-only mapping is fine.
+        data = np.memmap(path, dtype=np.complex64, mode="r")
+        _advise_sequential(data)
         return data
     elif fmt == "sc16":
-        raw = np.fromfile(path, dtype=np.int16)
+        raw = np.memmap(path, dtype=np.int16, mode="r")
         if raw.size % 2 != 0:
             raise ValueError("sc16 file length not even")
-        raw = raw.reshape(-1, 2)
-        iq = (raw[:,0].astype(np.float32) + 1j * raw[:,1].astype(np.float32)) / 32768.0
-        return iq.astype(np.complex64)
+        _advise_sequential(raw)
+        # One int16->float32 conversion, one in-place scale, then reinterpret
+        # the interleaved float pairs as complex64 — no per-component
+        # temporaries and no second complex allocation.
+        flt = raw.astype(np.float32)
+        flt *= np.float32(1.0 / 32768.0)
+        data = flt.view(np.complex64)
     else:
         raise ValueError("Unsupported FILE_FORMAT: use 'fc32' or 'sc16'")
+    # Enforce contiguous complex64 once here so the TX loop never has to
+    # convert per chunk.
+    return np.ascontiguousarray(data, dtype=np.complex64)
+
+def _advise_sequential(mapped):
+    """Hint the kernel that a memmapped array will be read sequentially."""
+    try:
+        mapped._mmap.madvise(mmap.MADV_SEQUENTIAL)
+    except (AttributeError, OSError):
+        pass  # madvise is best-effort; not available everywhere
+
+# Fused energy reductions: sum(|x|^2) in one pass with no temporaries.
+# np.sum(np.abs(x)**2) allocates two intermediate arrays per call, which on
+# 8192-sample recv chunks is mostly allocator churn rather than FLOPs.
+if HAVE_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def c64_energy(buf, n):
+        s = 0.0
+        for i in range(n):
+            s += buf[i].real * buf[i].real + buf[i].imag * buf[i].imag
+        return s
+
+    @njit(cache=True, fastmath=True)
+    def c64_residual_energy(rx_seg, tx_ref, n):
+        s = 0.0
+        for i in range(n):
+            dr = rx_seg[i].real - tx_ref[i].real
+            di = rx_seg[i].imag - tx_ref[i].imag
+            s += dr * dr + di * di
+        return s
+else:
+    def c64_energy(buf, n):
+        seg = buf[:n]
+        return float(np.sum(seg.real * seg.real + seg.imag * seg.imag))
+
+    def c64_residual_energy(rx_seg, tx_ref, n):
+        d = rx_seg[:n] - tx_ref[:n]
+        return float(np.sum(d.real * d.real + d.imag * d.imag))
 
 def tx_thread_fn(tx_stream, iq_data, stop_event):
     md = uhd.types.TXMetadata()
@@ -61,6 +178,10 @@ def tx_thread_fn(tx_stream, iq_data, stop_event):
     idx = 0
     first = True
     sent_chunks = 0
+    last_report = time.time()
+    # Preallocated send buffer: no per-chunk allocation, and UHD sees a
+    # stable buffer pointer across sends.
+    send_buf = np.empty(CHUNK_SAMPLES, dtype=np.complex64)
     try:
         while not stop_event.is_set():
             remaining = total - idx
@@ -71,19 +192,22 @@ def tx_thread_fn(tx_stream, iq_data, stop_event):
                 else:
                     break
             chunk_size = min(CHUNK_SAMPLES, remaining)
-            chunk = iq_data[idx: idx + chunk_size]
-            if chunk.dtype != np.complex64:
-                chunk = chunk.astype(np.complex64)
-            tx_stream.send(chunk, md)
+            np.copyto(send_buf[:chunk_size], iq_data[idx: idx + chunk_size])
+            tx_stream.send(send_buf[:chunk_size], md)
             if first:
                 md.start_of_burst = False
                 first = False
             idx += chunk_size
             sent_chunks += 1
-            if (sent_chunks % 200) == 0:
-                print(f"[TX] sent {sent_chunks} chunks, idx={idx}/{total}")
-            # small yield - tune if underflow occurs
-            time.sleep(0.0005)
+            # time-throttled status: print() costs ~100 us+ per call under
+            # load, so report at most once per second from the send loop
+            now = time.time()
+            if now - last_report >= 1.0:
+                last_report = now
+                sys.stdout.write(f"[TX] sent {sent_chunks} chunks, idx={idx}/{total}\n")
+                sys.stdout.flush()
+            # no sleep here: send blocks on UHD's credit-based flow control,
+            # which paces the loop far more accurately than a host timer
     except Exception as e:
         print("TX thread exception:", repr(e))
     finally:
@@ -93,10 +217,66 @@ def tx_thread_fn(tx_stream, iq_data, stop_event):
         except Exception:
             pass
 
-def rx_thread_fn(rx_stream, stop_event, out_filename):
+def rx_telemetry_thread_fn(telemetry_q, stop_event):
+    """Compute and print RX RMS off the recv path, throttled to ~1 Hz."""
+    last_print = 0.0
+    while not stop_event.is_set():
+        try:
+            chunk, recv_chunks, dropped = telemetry_q.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        now = time.time()
+        if now - last_print >= 1.0:
+            last_print = now
+            rms = np.sqrt(c64_energy(chunk, chunk.size) / max(1, chunk.size))
+            print(f"[RX] {recv_chunks} chunks, rms={rms:.6f}, dropped={dropped}")
+
+def rx_process_fn(dev_addr, stop_event, shm_name, lengths, head, tail):
+    """RX runs in its own interpreter so its recv loop never shares a GIL
+    with TX housekeeping.
+
+    Opens its own UHD session, configures the RX chain, and pushes each
+    received chunk into a shared-memory ring; the parent's writer thread
+    drains the ring to disk. Single producer (this process, advancing
+    ``head``) / single consumer (writer thread, advancing ``tail``), so the
+    two counters need no lock.
+    """
+    try:
+        usrp = uhd.usrp.MultiUSRP(dev_addr)
+    except Exception as e:
+        print("[RX] failed to open USRP in RX process:", e)
+        return
+    usrp.set_rx_rate(FS)
+    usrp.set_rx_freq(FC, CHAN)
+    usrp.set_rx_gain(RX_GAIN, CHAN)
+    try:
+        print(f"[RX] setting RX antenna for chan {CHAN} -> RX2")
+        usrp.set_rx_antenna("RX2", CHAN)
+    except Exception as e:
+        print("[RX] could not set RX antenna to RX2:", e)
+
+    rx_stream_args = uhd.usrp.StreamArgs("fc32", "sc16")
+    rx_stream_args.channels = [CHAN]
+    rx_stream_args.args = uhd.types.DeviceAddr("num_recv_frames=1024,recv_frame_size=8000")
+    rx_stream = usrp.get_rx_stream(rx_stream_args)
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((RX_RING_CHUNKS, CHUNK_SAMPLES), dtype=np.complex64, buffer=shm.buf)
     md = uhd.types.RXMetadata()
-    buf = np.zeros(CHUNK_SAMPLES, dtype=np.complex64)
-    with open(out_filename, "wb") as fh:
+    # one aligned buffer, reused for every recv
+    buf = aligned_c64(CHUNK_SAMPLES)
+    recv_chunks = 0
+    dropped = 0
+    md_errors = 0
+    last_err_report = 0.0
+    # RMS telemetry runs on its own thread: the recv loop only enqueues a
+    # chunk copy (and silently skips when the queue is full), so diagnostics
+    # never add latency to the hot path.
+    telemetry_q = queue.Queue(maxsize=8)
+    telemetry_thread = threading.Thread(target=rx_telemetry_thread_fn,
+                                        args=(telemetry_q, stop_event), daemon=True)
+    telemetry_thread.start()
+    try:
         while not stop_event.is_set():
             try:
                 num = rx_stream.recv(buf, md, timeout=2.0)
@@ -104,50 +284,228 @@ def rx_thread_fn(rx_stream, stop_event, out_filename):
                 print("RX recv exception:", e)
                 continue
             if md.error_code != uhd.types.RXMetadataErrorCode.none:
-                print(f"[RX] metadata error: {md.error_code}")
-            else:
-                if num > 0:
-                    fh.write(buf[:num].astype(np.complex64).tobytes())
-                    rms = np.sqrt(np.mean(np.abs(buf[:num])**2))
-                    print(f"[RX] {num} samples, rms={rms:.6f}")
-            time.sleep(0.0005)
+                # throttled: an overflow storm printing once per chunk would
+                # itself keep the loop overflowing
+                md_errors += 1
+                now = time.time()
+                if now - last_err_report >= 1.0:
+                    last_err_report = now
+                    sys.stdout.write(f"[RX] metadata error: {md.error_code} ({md_errors} total)\n")
+                    sys.stdout.flush()
+            elif num > 0:
+                if head.value - tail.value >= RX_RING_CHUNKS:
+                    dropped += 1  # writer fell behind; drop rather than stall recv
+                else:
+                    slot = head.value % RX_RING_CHUNKS
+                    np.copyto(ring[slot, :num], buf[:num])
+                    lengths[slot] = num
+                    head.value += 1
+                recv_chunks += 1
+                try:
+                    telemetry_q.put_nowait((buf[:num].copy(), recv_chunks, dropped))
+                except queue.Full:
+                    pass
+            # no sleep here: recv already blocks until samples arrive
+    finally:
+        shm.close()
+
+WRITE_BLOCK_BYTES = 4 * 1024 * 1024
+
+class DirectFileWriter:
+    """Capture-file writer that keeps long recordings out of the page cache.
 
-def fft_xcorr(a, b):
+    Accumulates sample bytes in a page-aligned staging buffer (an anonymous
+    mmap) and flushes whole 4 MiB blocks with a single os.write each. Opens
+    the file with O_DIRECT when the filesystem allows it, so a 20 MB/s
+    capture never builds up dirty pages whose writeback would backpressure
+    the recv path; where O_DIRECT is unsupported it falls back to normal
+    writes plus POSIX_FADV_DONTNEED on everything already written.
+    """
+
+    def __init__(self, path, block_bytes=WRITE_BLOCK_BYTES):
+        self.block_bytes = block_bytes
+        self.direct = True
+        try:
+            self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o644)
+        except OSError:
+            self.direct = False
+            self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        self.stage = mmap.mmap(-1, block_bytes)  # page-aligned staging buffer
+        self.fill = 0
+        self.written = 0
+
+    def write(self, data):
+        view = memoryview(data)
+        off = 0
+        while off < len(view):
+            take = min(self.block_bytes - self.fill, len(view) - off)
+            self.stage[self.fill:self.fill + take] = view[off:off + take]
+            self.fill += take
+            off += take
+            if self.fill == self.block_bytes:
+                self._flush_block()
+
+    def _flush_block(self):
+        os.write(self.fd, memoryview(self.stage)[:self.fill])
+        if not self.direct:
+            # O_DIRECT already bypasses the cache; otherwise tell the kernel
+            # we will never read these pages back
+            try:
+                os.posix_fadvise(self.fd, self.written, self.fill, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+        self.written += self.fill
+        self.fill = 0
+
+    def close(self):
+        if self.fill:
+            if self.direct:
+                # O_DIRECT needs block-aligned lengths; drop it for the tail
+                flags = fcntl.fcntl(self.fd, fcntl.F_GETFL)
+                fcntl.fcntl(self.fd, fcntl.F_SETFL, flags & ~os.O_DIRECT)
+            os.write(self.fd, memoryview(self.stage)[:self.fill])
+            self.fill = 0
+        os.close(self.fd)
+        self.stage.close()
+
+def rx_writer_thread_fn(stop_event, out_filename, shm, lengths, head, tail):
+    """Drain the shared-memory ring to disk (runs in the parent process)."""
+    ring = np.ndarray((RX_RING_CHUNKS, CHUNK_SAMPLES), dtype=np.complex64, buffer=shm.buf)
+    writer = DirectFileWriter(out_filename)
+    try:
+        while True:
+            if tail.value < head.value:
+                slot = tail.value % RX_RING_CHUNKS
+                n = lengths[slot]
+                writer.write(ring[slot, :n].tobytes())
+                tail.value += 1
+            elif stop_event.is_set():
+                break
+            else:
+                time.sleep(0.001)
+    finally:
+        writer.close()
+
+def _rfft_to_full(A, n):
+    """Expand an rfft half-spectrum to the full n-point spectrum (Hermitian symmetry)."""
+    m = A.size  # n // 2 + 1
+    full = np.empty(n, dtype=np.complex64)
+    full[:m] = A
+    full[m:] = np.conj(A[1:n - m + 1])[::-1]
+    return full
+
+def fft_xcorr(a, b, real_ref=False):
+    # Single-precision FFTs halve memory traffic and FLOPs vs the default
+    # complex128 path; the _fft/_ifft helpers run threaded (pyfftw with a
+    # persistent plan cache when available, pocketfft otherwise).
+    a = np.asarray(a, dtype=np.complex64)
+    b = np.asarray(b, dtype=np.complex64)
     na = a.size
     nb = b.size
-    n = 1 << (int(np.ceil(np.log2(na + nb - 1))))
-    A = np.fft.fft(a, n)
-    B = np.fft.fft(b, n)
-    corr = np.fft.ifft(B * np.conj(A))
+    # 5-smooth transform length: rounding up to the next power of two can
+    # nearly double the work (na+nb-1 ~ 1.1e6 would pad to 2^21), while
+    # pocketfft/FFTW are near-optimal at any small-prime-factor length.
+    n = scipy.fft.next_fast_len(na + nb - 1)
+    if HAVE_CUPY:
+        # One-shot post-capture analysis is an ideal GPU offload: ship both
+        # arrays over once, run cuFFT, bring only the correlation back.
+        a_d = cupy.asarray(a)
+        if real_ref:
+            a_d = cupy.ascontiguousarray(a_d.real).astype(cupy.complex64)
+        A = cupy.fft.fft(a_d, n)
+        B = cupy.fft.fft(cupy.asarray(b), n)
+        cupy.conjugate(A, out=A)
+        cupy.multiply(B, A, out=B)
+        corr = cupy.fft.ifft(B)
+        return cupy.asnumpy(corr[:(na + nb - 1)])
+    if real_ref:
+        # The reference is a real BPSK chip sequence: an rfft over tx.real
+        # does half the butterflies of the complex transform, then the half
+        # spectrum is mirrored back to full length for the multiply.
+        A = _rfft_to_full(_rfft(np.ascontiguousarray(a.real), n), n)
+    else:
+        A = _fft(a, n)
+    B = _fft(b, n)
+    # A and B are fresh transform outputs, so conjugate and multiply in
+    # place: no extra n-point complex allocations for np.conj / the product.
+    np.conjugate(A, out=A)
+    np.multiply(B, A, out=B)
+    corr = _ifft(B)
     return corr[:(na + nb - 1)]
 
+def coarse_acquire(tx, rx):
+    """Coarse code-phase / Doppler search exploiting the C/A code structure.
+
+    The GPS C/A code repeats every 1 ms, so instead of one monolithic FFT
+    over the whole capture we circularly correlate the first 1 ms of the TX
+    reference against N consecutive 1 ms RX blocks, sweep a grid of Doppler
+    bins by wiping each candidate carrier off the RX blocks, and sum the
+    correlation power non-coherently across blocks. Returns
+    (code_phase_samples, doppler_hz, peak_metric) or None if there isn't a
+    full millisecond of data.
+    """
+    ms_samples = int(round(FS * 1e-3))
+    n_blocks = min(COARSE_ACQ_BLOCKS, rx.size // ms_samples)
+    if n_blocks == 0 or tx.size < ms_samples:
+        return None
+
+    rx_blocks = rx[:n_blocks * ms_samples].reshape(n_blocks, ms_samples)
+    code_fft_conj = np.conj(_fft(np.ascontiguousarray(tx[:ms_samples]), ms_samples))
+    t = np.arange(ms_samples, dtype=np.float32) / np.float32(FS)
+
+    best_metric = -1.0
+    best_phase = 0
+    best_doppler = 0.0
+    for doppler in np.arange(-DOPPLER_MAX, DOPPLER_MAX + DOPPLER_STEP, DOPPLER_STEP):
+        wipe = np.exp(-2j * np.pi * doppler * t).astype(np.complex64)
+        B = _fft(rx_blocks * wipe[None, :], ms_samples)
+        corr = _ifft(B * code_fft_conj[None, :])
+        # non-coherent integration across the 1 ms blocks
+        metric = np.sum(corr.real ** 2 + corr.imag ** 2, axis=0)
+        idx = int(np.argmax(metric))
+        if metric[idx] > best_metric:
+            best_metric = float(metric[idx])
+            best_phase = idx
+            best_doppler = float(doppler)
+    return best_phase, best_doppler, best_metric
+
 def analyze_correlation(tx_samples, rx_samples):
-    tx = tx_samples[:min(tx_samples.size, TX_REF_SAMPLES)]
-    rx = rx_samples[:min(rx_samples.size, CORR_SEARCH_SAMPLES)]
+    tx = np.asarray(tx_samples[:min(tx_samples.size, TX_REF_SAMPLES)], dtype=np.complex64)
+    rx = np.asarray(rx_samples[:min(rx_samples.size, CORR_SEARCH_SAMPLES)], dtype=np.complex64)
 
     print(f"Analyzing correlation: TX {tx.size} samples vs RX {rx.size} samples (caps applied)")
 
-    corr = fft_xcorr(tx, rx)
+    # Coarse 1 ms acquisition first: finds the Doppler offset at a tiny
+    # fraction of the cost of the full-length correlation, and wiping it
+    # off beforehand keeps the long coherent correlation peak sharp.
+    acq = coarse_acquire(tx, rx)
+    coarse_phase = None
+    coarse_doppler = 0.0
+    if acq is not None:
+        coarse_phase, coarse_doppler, _ = acq
+        print(f"Coarse acquisition: code phase {coarse_phase} samples, "
+              f"Doppler {coarse_doppler:+.0f} Hz")
+        if coarse_doppler != 0.0:
+            n = np.arange(rx.size, dtype=np.float32)
+            rx = rx * np.exp(-2j * np.pi * coarse_doppler * n / np.float32(FS)).astype(np.complex64)
+
+    corr = fft_xcorr(tx, rx, real_ref=REAL_REF)
     abs_corr = np.abs(corr)
     peak_idx = np.argmax(abs_corr)
     peak_val = abs_corr[peak_idx]
     lag = peak_idx - (tx.size - 1)
-    E_tx = np.sum(np.abs(tx)**2)
+    E_tx = c64_energy(tx, tx.size)
 
     start = max(0, lag)
-    end = start + tx.size
-    if end <= rx.size:
-        rx_segment = rx[start:end]
-        E_rx_seg = np.sum(np.abs(rx_segment)**2)
-    else:
-        rx_segment = rx[start:rx.size]
-        E_rx_seg = np.sum(np.abs(rx_segment)**2)
+    end = min(start + tx.size, rx.size)
+    rx_segment = rx[start:end]
+    E_rx_seg = c64_energy(rx_segment, rx_segment.size)
 
     norm_peak = peak_val / (np.sqrt(E_tx * (E_rx_seg + 1e-12)) + 1e-24)
 
-    signal_power = np.sum(np.abs(rx_segment)**2) / max(1, rx_segment.size)
-    residual = rx_segment - tx[:rx_segment.size]
-    noise_power = np.sum(np.abs(residual)**2) / max(1, residual.size)
+    signal_power = E_rx_seg / max(1, rx_segment.size)
+    n_res = rx_segment.size
+    noise_power = c64_residual_energy(rx_segment, tx, n_res) / max(1, n_res)
     snr_est = 10 * np.log10(max(1e-12, signal_power / (noise_power + 1e-12)))
 
     return {
@@ -157,6 +515,8 @@ def analyze_correlation(tx_samples, rx_samples):
         "norm_peak": float(norm_peak),
         "snr_db_est": float(snr_est),
         "E_tx": float(E_tx),
+        "coarse_code_phase": None if coarse_phase is None else int(coarse_phase),
+        "coarse_doppler_hz": float(coarse_doppler),
     }
 
 def main():
@@ -174,23 +534,22 @@ def main():
         print("Failed to open USRP:", e)
         sys.exit(1)
 
-    # configure device
+    # configure device (TX only here; the RX process owns the RX chain)
     usrp.set_tx_rate(FS)
-    usrp.set_rx_rate(FS)
     usrp.set_tx_freq(FC, CHAN)
-    usrp.set_rx_freq(FC, CHAN)
     usrp.set_tx_gain(TX_GAIN, CHAN)
-    usrp.set_rx_gain(RX_GAIN, CHAN)
+    # anchor the device clock so flow control works from hardware time
+    try:
+        usrp.set_time_now(uhd.types.TimeSpec(0.0))
+    except Exception as e:
+        print("Could not set device time:", e)
 
     # Print available antenna names
     try:
         tx_antennas = usrp.get_tx_antennas(CHAN)
-        rx_antennas = usrp.get_rx_antennas(CHAN)
         print("TX Antennas (chan {}): {}".format(CHAN, tx_antennas))
-        print("RX Antennas (chan {}): {}".format(CHAN, rx_antennas))
     except Exception:
         tx_antennas = []
-        rx_antennas = []
         print("Couldn't query antenna lists for channel", CHAN)
 
     # === HARD-SET CORRECT ANTENNA PORTS ===
@@ -199,24 +558,18 @@ def main():
         usrp.set_tx_antenna("TX/RX", CHAN)
     except Exception as e:
         print("Could not set TX antenna:", e)
-
-    try:
-        print(f"Setting RX antenna for chan {CHAN} -> RX2")
-        usrp.set_rx_antenna("RX2", CHAN)
-    except Exception as e:
-        print("Could not set RX antenna to RX2:", e)
-        print("Available RX antennas:", rx_antennas)
     # ======================================
 
     # StreamArgs requires (cpu_format, wire_format)
-    # Use 'fc32' on host and 'sc16' on the wire for X3xx family
+    # Use 'fc32' on host and 'sc16' on the wire for X3xx family.
+    # Enlarged transport rings: the X310 defaults are small enough that
+    # ordinary scheduler jitter causes O/U at modest rates; 1024 frames of
+    # ~8000 bytes gives the kernel several ms of slack on each side.
     tx_stream_args = uhd.usrp.StreamArgs("fc32", "sc16")
     tx_stream_args.channels = [CHAN]
-    rx_stream_args = uhd.usrp.StreamArgs("fc32", "sc16")
-    rx_stream_args.channels = [CHAN]
+    tx_stream_args.args = uhd.types.DeviceAddr("num_send_frames=1024,send_frame_size=8000")
 
     tx_stream = usrp.get_tx_stream(tx_stream_args)
-    rx_stream = usrp.get_rx_stream(rx_stream_args)
 
     # print stream channel mapping if available
     try:
@@ -224,28 +577,47 @@ def main():
             print("TX stream channels:", tx_stream.get_channels())
     except Exception:
         pass
-    try:
-        if hasattr(rx_stream, "get_channels"):
-            print("RX stream channels:", rx_stream.get_channels())
-    except Exception:
-        pass
 
-    stop_event = threading.Event()
+    # RX runs in a separate process with its own GIL; the only shared state
+    # is a complex64 ring in shared memory plus lock-free head/tail counters
+    # (single producer in the RX process, single consumer in the writer
+    # thread below).
+    ctx = multiprocessing.get_context("fork")
+    stop_event = ctx.Event()
+    shm = shared_memory.SharedMemory(create=True,
+                                     size=RX_RING_CHUNKS * CHUNK_SAMPLES * 8)
+    lengths = ctx.Array('q', RX_RING_CHUNKS, lock=False)
+    head = ctx.Value('Q', 0, lock=False)
+    tail = ctx.Value('Q', 0, lock=False)
+
     tx_thread = threading.Thread(target=tx_thread_fn, args=(tx_stream, iq_data, stop_event), daemon=True)
-    rx_thread = threading.Thread(target=rx_thread_fn, args=(rx_stream, stop_event, OUT_RX_FILENAME), daemon=True)
+    rx_proc = ctx.Process(target=rx_process_fn,
+                          args=(USR_ADDR, stop_event, shm.name, lengths, head, tail),
+                          daemon=True)
+    writer_thread = threading.Thread(target=rx_writer_thread_fn,
+                                     args=(stop_event, OUT_RX_FILENAME, shm, lengths, head, tail),
+                                     daemon=True)
 
     print("Starting TX & RX. Ensure TX -> attenuator -> RX cable is connected (attenuator >= {} dB)".format(ATTENUATOR_DB))
+    rx_proc.start()
+    writer_thread.start()
     tx_thread.start()
-    rx_thread.start()
 
     try:
         while True:
             time.sleep(1.0)
     except KeyboardInterrupt:
-        print("\nKeyboard interrupt received — stopping threads...")
+        print("\nKeyboard interrupt received — stopping TX thread and RX process...")
         stop_event.set()
         tx_thread.join(timeout=2.0)
-        rx_thread.join(timeout=2.0)
+        rx_proc.join(timeout=5.0)
+        writer_thread.join(timeout=5.0)
+    finally:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
 
     # After stopping, analyze captured file
     if not os.path.exists(OUT_RX_FILENAME):
@@ -266,6 +638,9 @@ def main():
     print("\n=== CORRELATION SUMMARY ===")
     print(f"Peak index (corr array): {result['peak_index']}")
     print(f"Lag (samples, RX = TX shifted by): {result['lag_samples']}")
+    if result['coarse_code_phase'] is not None:
+        print(f"Coarse code phase (mod 1 ms): {result['coarse_code_phase']} samples, "
+              f"Doppler {result['coarse_doppler_hz']:+.0f} Hz")
     print(f"Normalized peak (0..1 scale, 1 strong match): {result['norm_peak']:.6f}")
     print(f"Estimated SNR (dB): {result['snr_db_est']:.2f}")
     print("===========================")
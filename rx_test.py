@@ -29,21 +29,34 @@ rx_args = uhd.usrp.StreamArgs("fc32", "sc16")
 rx_args.channels = [CHAN]
 rx_stream = usrp.get_rx_stream(rx_args)
 
-buf = np.zeros(BUF, dtype=np.complex64)
+# 64-byte-aligned recv buffer when pyfftw is available (aligned SIMD loads
+# for the RMS math, and UHD fills the same buffer every call)
+try:
+    import pyfftw
+    buf = pyfftw.empty_aligned(BUF, dtype='complex64', n=64)
+    buf[:] = 0
+except ImportError:
+    buf = np.zeros(BUF, dtype=np.complex64)
 md = uhd.types.RXMetadata()
 
 print(f"Starting RX-only test for {TEST_SECONDS}s on CHAN={CHAN}, ANT=RX2 ...")
 t0 = time.time()
+i = 0
 while time.time() - t0 < TEST_SECONDS:
     try:
         num = rx_stream.recv(buf, md, timeout=1.0)
     except Exception as e:
         print("recv exception:", e)
         break
-    print("md:", md.error_code, "num:", num)
-    if md.error_code == uhd.types.RXMetadataErrorCode.none and num > 0:
+    # No sleep here: recv blocks until samples arrive, and at 2.5 Msps a
+    # stalled loop overflows UHD's ring and spews misleading metadata errors.
+    # Printing every chunk is itself slow enough to backlog the stream, so
+    # only report every 128th chunk (errors are always reported).
+    if md.error_code != uhd.types.RXMetadataErrorCode.none:
+        print("md:", md.error_code, "num:", num)
+    elif num > 0 and (i % 128) == 0:
         rms = np.sqrt(np.mean(np.abs(buf[:num])**2))
         print(f"Got {num} samples   rms={rms:.6e}")
-    time.sleep(0.1)
+    i += 1
 
 print("RX-only CHAN0 test complete.")